@@ -12,6 +12,7 @@ Finally, a database can integrate the change of another database via a pull.
 See the [unit tests](../test/test_crr.py) for code examples.
 """
 
+import functools
 import typing
 import logging
 import pathlib
@@ -43,7 +44,7 @@ def init(
     See `clone_to` and `pull_from` functions."""
 
     sql_ar_schema = _get_schema(db)
-    tables = sql.symbols(parse_schema(sql_ar_schema))
+    tables = sql.symbols(_parse_schema(sql_ar_schema))
     with closing(db.cursor()) as cursor:
         cursor.executescript(
             _CREATE_TABLE_CONTEXT
@@ -74,7 +75,7 @@ def clone_to(
 def pull_from(db: sqlite3.Connection, remote_db_path: pathlib.Path | str, /) -> None:
     """Pull state of `remote_db_path` in `db`."""
     sql_ar_schema = _get_schema(db)
-    tables = sql.symbols(parse_schema(sql_ar_schema))
+    tables = sql.symbols(_parse_schema(sql_ar_schema))
     merging = _create_pull(tables)
     result = f"""
         PRAGMA defer_foreign_keys = ON;  -- automatically switch off at the end of transaction
@@ -615,6 +616,15 @@ def _get_schema(db: sqlite3.Connection, /) -> str:
     return result
 
 
+@functools.lru_cache(maxsize=32)
+def _parse_schema(sql_ar_schema: str, /) -> sql.Schema:
+    """Same as `parse_schema`, memoized.
+
+    Replicas of a database share their schema, and every pull parses it again.
+    Parsed schemas are immutable: they can be safely shared."""
+    return parse_schema(sql_ar_schema)
+
+
 _PULL_EXTERN = """
 -- Update clock
 UPDATE _synql_local SET ts = max(_synql_local.ts, max(ctx.ts)) + 1
@@ -0,0 +1,28 @@
+# Copyright (c) 2022 Inria, Victorien Elvinger
+# Licensed under the MIT License (https://mit-license.org/)
+
+"""Shared test fixtures."""
+
+import typing
+import urllib.parse
+import pytest
+import pysqlite3 as sqlite3
+from .test_utils import connect
+
+
+@pytest.fixture(name="mem_uri")
+def fixture_mem_uri(request: pytest.FixtureRequest) -> typing.Callable[[str], str]:
+    """Returns the URI of the in-memory database `name` private to the requesting test.
+
+    The database lives as long as a connection to it is open.
+    Unlike `:memory:`, its URI can be passed to `crr.pull_from`."""
+    test_id = urllib.parse.quote(request.node.nodeid, safe="")
+    return lambda name: f"file:{test_id}-{name}?mode=memory&cache=shared"
+
+
+@pytest.fixture
+def mem_db() -> typing.Iterator[sqlite3.Connection]:
+    """In-memory database private to the requesting test."""
+    db = connect(":memory:")
+    yield db
+    db.close()
@@ -3,19 +3,32 @@
 
 """Unit tests."""
 
+from contextlib import closing
 import pathlib
+import typing
+import pytest
 import pysqlite3 as sqlite3
 from synql import crr
-from .test_utils import execute, crr_from, Val, Undo, Crr
-
-# We disable physical clock in order to get deterministic logical timestamps.
-# In this case, every clock corresponds to the latest seen clock incremented by 1.
-_DEFAULT_CONF = crr.Config(physical_clock=False)
-
-
-def test_crr_init(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a:
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
+from .test_utils import (
+    connect,
+    execute,
+    execute_many,
+    transaction,
+    crr_init,
+    crr_init_clone,
+    crr_pull_from,
+    crr_pull_by,
+    crr_from,
+    DEFAULT_CONF,
+    Val,
+    Undo,
+    Crr,
+)
+
+
+def test_crr_init() -> None:
+    with closing(sqlite3.connect(":memory:")) as a:
+        crr.init(a, replica_id=1, conf=DEFAULT_CONF)
         assert crr_from(a) == Crr(
             tbls={},
             ctx={1: 0},
@@ -23,352 +36,331 @@ def test_crr_init(tmp_path: pathlib.Path) -> None:
         )
 
 
-def test_aliased_rowid(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x integer PRIMARY KEY)")
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-
-        execute(a, "INSERT INTO X VALUES(1)")
-        assert crr_from(a) == Crr(
-            tbls={"X": {(1, (1, 1))}},
-            ctx={1: 1},
-            log=set(),
-        )
-
-        execute(a, "UPDATE X SET x = 2")
-        assert crr_from(a) == Crr(
-            tbls={"X": {(2, (1, 1))}},
-            ctx={1: 1},
-            log=set(),
-        )
-
-        # Test rowid aliases (rowid, _rowid_, oid)
-        execute(a, "UPDATE X SET rowid = 3")
-        assert crr_from(a) == Crr(
-            tbls={"X": {(3, (1, 1))}},
-            ctx={1: 1},
-            log=set(),
-        )
-
-        execute(a, "UPDATE X SET _rowid_ = 4")
-        assert crr_from(a) == Crr(
-            tbls={"X": {(4, (1, 1))}},
-            ctx={1: 1},
-            log=set(),
-        )
-
-        execute(a, "UPDATE X SET oid = 5")
-        assert crr_from(a) == Crr(
-            tbls={"X": {(5, (1, 1))}},
-            ctx={1: 1},
-            log=set(),
-        )
-
-        execute(a, "DELETE FROM X")
-        assert crr_from(a) == Crr(
-            tbls={"X": set()},
-            ctx={1: 2},
-            log={Undo(ts=(2, 1), obj=(1, 1), ul=1)},
-        )
-
+def test_aliased_rowid(mem_db: sqlite3.Connection) -> None:
+    a = mem_db
+    crr_init(a, "CREATE TABLE X(x integer PRIMARY KEY)")
+
+    execute(a, "INSERT INTO X VALUES(1)")
+    assert crr_from(a) == Crr(
+        tbls={"X": {(1, (1, 1))}},
+        ctx={1: 1},
+        log=set(),
+    )
+
+    execute(a, "UPDATE X SET x = 2")
+    assert crr_from(a) == Crr(
+        tbls={"X": {(2, (1, 1))}},
+        ctx={1: 1},
+        log=set(),
+    )
+
+    # Test rowid aliases (rowid, _rowid_, oid)
+    execute(a, "UPDATE X SET rowid = 3")
+    assert crr_from(a) == Crr(
+        tbls={"X": {(3, (1, 1))}},
+        ctx={1: 1},
+        log=set(),
+    )
+
+    execute(a, "UPDATE X SET _rowid_ = 4")
+    assert crr_from(a) == Crr(
+        tbls={"X": {(4, (1, 1))}},
+        ctx={1: 1},
+        log=set(),
+    )
+
+    execute(a, "UPDATE X SET oid = 5")
+    assert crr_from(a) == Crr(
+        tbls={"X": {(5, (1, 1))}},
+        ctx={1: 1},
+        log=set(),
+    )
+
+    execute(a, "DELETE FROM X")
+    assert crr_from(a) == Crr(
+        tbls={"X": set()},
+        ctx={1: 2},
+        log={Undo(ts=(2, 1), obj=(1, 1), ul=1)},
+    )
+
+    with transaction(a):
         execute(a, "INSERT INTO X VALUES(1)")
         execute(a, "INSERT OR REPLACE INTO X VALUES(1)")
-        assert crr_from(a) == Crr(
-            tbls={"X": {(1, (5, 1))}},
-            ctx={1: 5},
-            log={Undo(ts=(4, 1), obj=(3, 1), ul=1), Undo(ts=(2, 1), obj=(1, 1), ul=1)},
-        )
-
-        execute(a, "INSERT INTO X VALUES(1) ON CONFLICT(x) DO UPDATE SET x = 2")
-        assert crr_from(a) == Crr(
-            tbls={"X": {(2, (5, 1))}},
-            ctx={1: 5},
-            log={Undo(ts=(4, 1), obj=(3, 1), ul=1), Undo(ts=(2, 1), obj=(1, 1), ul=1)},
-        )
-        execute(a, "PRAGMA integrity_check")
-
-
-def test_repl_col(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x integer PRIMARY KEY AUTOINCREMENT, v text)")
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-
-        execute(a, "INSERT INTO X(v) VALUES('v1')")
-        assert crr_from(a) == Crr(
-            tbls={"X": {(1, "v1", (1, 1))}},
-            ctx={1: 1},
-            log={Val(ts=(1, 1), row=(1, 1), name="v", val="v1")},
-        )
-
-        execute(a, "UPDATE X SET v = 'v2'")
-        assert crr_from(a) == Crr(
-            tbls={"X": {(1, "v2", (1, 1))}},
-            ctx={1: 2},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="v", val="v1"),
-                Val(ts=(2, 1), row=(1, 1), name="v", val="v2"),
-            },
-        )
-        execute(a, "PRAGMA integrity_check")
-
-
-def test_repl_pk(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x int PRIMARY KEY)")
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-
-        execute(a, "INSERT INTO X VALUES(1)")
-        assert crr_from(a) == Crr(
-            tbls={"X": {(1, (1, 1))}},
-            ctx={1: 1},
-            log={Val(ts=(1, 1), row=(1, 1), name="x", val=1)},
-        )
-
-        execute(a, "INSERT INTO X VALUES(1) ON CONFLICT(x) DO UPDATE SET x = 2")
-        assert crr_from(a) == Crr(
-            tbls={"X": {(2, (1, 1))}},
-            ctx={1: 2},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="x", val=1),
-                Val(ts=(2, 1), row=(1, 1), name="x", val=2),
-            },
-        )
-        execute(a, "PRAGMA integrity_check")
-
-
-def test_fk_aliased_rowid(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x integer PRIMARY KEY)")
-        execute(
-            a,
-            "CREATE TABLE Y(y integer PRIMARY KEY, x integer CONSTRAINT fk REFERENCES X(x))",
-        )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-
+    assert crr_from(a) == Crr(
+        tbls={"X": {(1, (5, 1))}},
+        ctx={1: 5},
+        log={Undo(ts=(4, 1), obj=(3, 1), ul=1), Undo(ts=(2, 1), obj=(1, 1), ul=1)},
+    )
+
+    execute(a, "INSERT INTO X VALUES(1) ON CONFLICT(x) DO UPDATE SET x = 2")
+    assert crr_from(a) == Crr(
+        tbls={"X": {(2, (5, 1))}},
+        ctx={1: 5},
+        log={Undo(ts=(4, 1), obj=(3, 1), ul=1), Undo(ts=(2, 1), obj=(1, 1), ul=1)},
+    )
+    execute(a, "PRAGMA integrity_check")
+
+
+def test_repl_col(mem_db: sqlite3.Connection) -> None:
+    a = mem_db
+    crr_init(a, "CREATE TABLE X(x integer PRIMARY KEY AUTOINCREMENT, v text)")
+
+    execute(a, "INSERT INTO X(v) VALUES('v1')")
+    assert crr_from(a) == Crr(
+        tbls={"X": {(1, "v1", (1, 1))}},
+        ctx={1: 1},
+        log={Val(ts=(1, 1), row=(1, 1), name="v", val="v1")},
+    )
+
+    execute(a, "UPDATE X SET v = 'v2'")
+    assert crr_from(a) == Crr(
+        tbls={"X": {(1, "v2", (1, 1))}},
+        ctx={1: 2},
+        log={
+            Val(ts=(1, 1), row=(1, 1), name="v", val="v1"),
+            Val(ts=(2, 1), row=(1, 1), name="v", val="v2"),
+        },
+    )
+    execute(a, "PRAGMA integrity_check")
+
+
+def test_repl_pk(mem_db: sqlite3.Connection) -> None:
+    a = mem_db
+    crr_init(a, "CREATE TABLE X(x int PRIMARY KEY)")
+
+    execute(a, "INSERT INTO X VALUES(1)")
+    assert crr_from(a) == Crr(
+        tbls={"X": {(1, (1, 1))}},
+        ctx={1: 1},
+        log={Val(ts=(1, 1), row=(1, 1), name="x", val=1)},
+    )
+
+    execute(a, "INSERT INTO X VALUES(1) ON CONFLICT(x) DO UPDATE SET x = 2")
+    assert crr_from(a) == Crr(
+        tbls={"X": {(2, (1, 1))}},
+        ctx={1: 2},
+        log={
+            Val(ts=(1, 1), row=(1, 1), name="x", val=1),
+            Val(ts=(2, 1), row=(1, 1), name="x", val=2),
+        },
+    )
+    execute(a, "PRAGMA integrity_check")
+
+
+def test_fk_aliased_rowid(mem_db: sqlite3.Connection) -> None:
+    a = mem_db
+    crr_init(
+        a,
+        """
+        CREATE TABLE X(x integer PRIMARY KEY);
+        CREATE TABLE Y(y integer PRIMARY KEY, x integer CONSTRAINT fk REFERENCES X(x));
+        """,
+    )
+
+    with transaction(a):
         execute(a, "INSERT INTO X VALUES(1)")
         execute(a, "INSERT INTO Y VALUES(1, 1)")
-        assert crr_from(a) == Crr(
-            tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 1))}},
-            ctx={1: 2},
-            log={
-                Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
-            },
-        )
-
+    assert crr_from(a) == Crr(
+        tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 1))}},
+        ctx={1: 2},
+        log={
+            Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
+        },
+    )
+
+    with transaction(a):
         execute(a, "INSERT INTO X VALUES(2)")
         execute(a, "UPDATE Y SET x = 2")
 
-        assert crr_from(a) == Crr(
-            tbls={"X": {(1, (1, 1)), (2, (3, 1))}, "Y": {(1, 2, (2, 1))}},
-            ctx={1: 4},
-            log={
-                Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
-                Val(ts=(4, 1), row=(2, 1), name="fk", val=(3, 1)),
-            },
-        )
-        execute(a, "PRAGMA integrity_check")
-
-
-def test_fk_repl_col(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x int PRIMARY KEY)")
-        execute(
-            a,
-            "CREATE TABLE Y(y integer PRIMARY KEY, x integer CONSTRAINT fk REFERENCES X(x))",
-        )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
+    assert crr_from(a) == Crr(
+        tbls={"X": {(1, (1, 1)), (2, (3, 1))}, "Y": {(1, 2, (2, 1))}},
+        ctx={1: 4},
+        log={
+            Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
+            Val(ts=(4, 1), row=(2, 1), name="fk", val=(3, 1)),
+        },
+    )
+    execute(a, "PRAGMA integrity_check")
+
+
+def test_fk_repl_col(mem_db: sqlite3.Connection) -> None:
+    a = mem_db
+    crr_init(
+        a,
+        """
+        CREATE TABLE X(x int PRIMARY KEY);
+        CREATE TABLE Y(y integer PRIMARY KEY, x integer CONSTRAINT fk REFERENCES X(x));
+        """,
+    )
+    with transaction(a):
         execute(a, "INSERT INTO X VALUES(1)")
         execute(a, "INSERT INTO Y VALUES(1, 1)")
 
-        assert crr_from(a) == Crr(
-            tbls={
-                "X": {(1, (1, 1))},
-                "Y": {(1, 1, (2, 1))},
-            },
-            ctx={1: 2},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="x", val=1),
-                Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
-            },
-        )
-
+    assert crr_from(a) == Crr(
+        tbls={
+            "X": {(1, (1, 1))},
+            "Y": {(1, 1, (2, 1))},
+        },
+        ctx={1: 2},
+        log={
+            Val(ts=(1, 1), row=(1, 1), name="x", val=1),
+            Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
+        },
+    )
+
+    with transaction(a):
         execute(a, "INSERT INTO X VALUES(2)")
         execute(a, "UPDATE Y SET x = 2")
 
-        assert crr_from(a) == Crr(
-            tbls={
-                "X": {(1, (1, 1)), (2, (3, 1))},
-                "Y": {(1, 2, (2, 1))},
-            },
-            ctx={1: 4},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="x", val=1),
-                Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
-                Val(ts=(3, 1), row=(3, 1), name="x", val=2),
-                Val(ts=(4, 1), row=(2, 1), name="fk", val=(3, 1)),
-            },
-        )
-        execute(a, "PRAGMA integrity_check")
-
-
-def test_fk_repl_multi_col(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(
-            a,
-            "CREATE TABLE X(x integer PRIMARY KEY, x1 integer, x2 integer, UNIQUE(x1,x2))",
-        )
-        execute(
-            a,
-            """CREATE TABLE Y(
-                y integer PRIMARY KEY,
-                x1 integer,
-                x2 integer,
-                CONSTRAINT fk FOREIGN KEY(x1,x2) REFERENCES X(x1, x2)
-            )""",
-        )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
+    assert crr_from(a) == Crr(
+        tbls={
+            "X": {(1, (1, 1)), (2, (3, 1))},
+            "Y": {(1, 2, (2, 1))},
+        },
+        ctx={1: 4},
+        log={
+            Val(ts=(1, 1), row=(1, 1), name="x", val=1),
+            Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
+            Val(ts=(3, 1), row=(3, 1), name="x", val=2),
+            Val(ts=(4, 1), row=(2, 1), name="fk", val=(3, 1)),
+        },
+    )
+    execute(a, "PRAGMA integrity_check")
+
+
+def test_fk_repl_multi_col(mem_db: sqlite3.Connection) -> None:
+    a = mem_db
+    crr_init(
+        a,
+        """
+        CREATE TABLE X(x integer PRIMARY KEY, x1 integer, x2 integer, UNIQUE(x1,x2));
+        CREATE TABLE Y(
+            y integer PRIMARY KEY,
+            x1 integer,
+            x2 integer,
+            CONSTRAINT fk FOREIGN KEY(x1,x2) REFERENCES X(x1, x2)
+        );
+        """,
+    )
+    with transaction(a):
         execute(a, "INSERT INTO X VALUES(1, 2, 3)")
         execute(a, "INSERT INTO Y VALUES(1, 2, 3)")
 
-        assert crr_from(a) == Crr(
-            tbls={
-                "X": {
-                    (1, 2, 3, (1, 1)),
-                },
-                "Y": {
-                    (1, 2, 3, (2, 1)),
-                },
+    assert crr_from(a) == Crr(
+        tbls={
+            "X": {
+                (1, 2, 3, (1, 1)),
             },
-            ctx={1: 2},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="x1", val=2),
-                Val(ts=(1, 1), row=(1, 1), name="x2", val=3),
-                Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
+            "Y": {
+                (1, 2, 3, (2, 1)),
             },
-        )
+        },
+        ctx={1: 2},
+        log={
+            Val(ts=(1, 1), row=(1, 1), name="x1", val=2),
+            Val(ts=(1, 1), row=(1, 1), name="x2", val=3),
+            Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
+        },
+    )
 
+    with transaction(a):
         execute(a, "INSERT INTO X VALUES(2, 3, 4)")
         execute(a, "UPDATE Y SET x1 = 3, x2 = 4")
 
-        assert crr_from(a) == Crr(
-            tbls={
-                "X": {
-                    (1, 2, 3, (1, 1)),
-                    (2, 3, 4, (3, 1)),
-                },
-                "Y": {
-                    (1, 3, 4, (2, 1)),
-                },
-            },
-            ctx={1: 4},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="x1", val=2),
-                Val(ts=(1, 1), row=(1, 1), name="x2", val=3),
-                Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
-                Val(ts=(3, 1), row=(3, 1), name="x1", val=3),
-                Val(ts=(3, 1), row=(3, 1), name="x2", val=4),
-                Val(ts=(4, 1), row=(2, 1), name="fk", val=(3, 1)),
-            },
-        )
-        execute(a, "PRAGMA integrity_check")
-
-
-def test_fk_up_cascade(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x int PRIMARY KEY)")
-        execute(
-            a,
-            """CREATE TABLE Y(
-                y integer PRIMARY KEY,
-                x integer CONSTRAINT fk REFERENCES X(x) ON UPDATE CASCADE
-            )""",
-        )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
+    assert crr_from(a) == Crr(
+        tbls={
+            "X": {
+                (1, 2, 3, (1, 1)),
+                (2, 3, 4, (3, 1)),
+            },
+            "Y": {
+                (1, 3, 4, (2, 1)),
+            },
+        },
+        ctx={1: 4},
+        log={
+            Val(ts=(1, 1), row=(1, 1), name="x1", val=2),
+            Val(ts=(1, 1), row=(1, 1), name="x2", val=3),
+            Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
+            Val(ts=(3, 1), row=(3, 1), name="x1", val=3),
+            Val(ts=(3, 1), row=(3, 1), name="x2", val=4),
+            Val(ts=(4, 1), row=(2, 1), name="fk", val=(3, 1)),
+        },
+    )
+    execute(a, "PRAGMA integrity_check")
+
+
+@pytest.mark.parametrize(
+    "action, y_x",
+    [("CASCADE", 2), ("SET NULL", None)],
+    ids=["cascade", "set_null"],
+)
+def test_fk_up_action(mem_db: sqlite3.Connection, action: str, y_x: int | None) -> None:
+    a = mem_db
+    crr_init(
+        a,
+        f"""
+        CREATE TABLE X(x int PRIMARY KEY);
+        CREATE TABLE Y(
+            y integer PRIMARY KEY,
+            x integer CONSTRAINT fk REFERENCES X(x) ON UPDATE {action}
+        );
+        """,
+    )
+    with transaction(a):
         execute(a, "INSERT INTO X VALUES(1)")
         execute(a, "INSERT INTO Y VALUES(1, 1)")
         execute(a, "UPDATE X SET x=2")
 
-        assert crr_from(a) == Crr(
-            tbls={"X": {(2, (1, 1))}, "Y": {(1, 2, (2, 1))}},
-            ctx={1: 4},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="x", val=1),
-                Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
-                Val(ts=(4, 1), row=(1, 1), name="x", val=2),
-            },
-        )
-        execute(a, "PRAGMA integrity_check")
-
-
-def test_fk_up_set_null(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x int PRIMARY KEY)")
-        execute(
-            a,
-            """CREATE TABLE Y(
-                y integer PRIMARY KEY,
-                x integer CONSTRAINT fk REFERENCES X(x) ON UPDATE SET NULL
-            )""",
-        )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        execute(a, "INSERT INTO X VALUES(1)")
-        execute(a, "INSERT INTO Y VALUES(1, 1)")
-        execute(a, "UPDATE X SET x=2")
-
-        assert crr_from(a) == Crr(
-            tbls={"X": {(2, (1, 1))}, "Y": {(1, None, (2, 1))}},
-            ctx={1: 4},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="x", val=1),
-                Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
-                Val(ts=(4, 1), row=(1, 1), name="x", val=2),
-            },
-        )
-        execute(a, "PRAGMA integrity_check")
-
-
-def test_clone_to(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
+    assert crr_from(a) == Crr(
+        tbls={"X": {(2, (1, 1))}, "Y": {(1, y_x, (2, 1))}},
+        ctx={1: 4},
+        log={
+            Val(ts=(1, 1), row=(1, 1), name="x", val=1),
+            Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
+            Val(ts=(4, 1), row=(1, 1), name="x", val=2),
+        },
+    )
+    execute(a, "PRAGMA integrity_check")
+
+
+def test_clone_to() -> None:
+    with closing(sqlite3.connect(":memory:")) as a, closing(
+        sqlite3.connect(":memory:")
     ) as b:
         execute(a, "PRAGMA foreign_keys=ON")
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
+        crr.init(a, replica_id=1, conf=DEFAULT_CONF)
 
         crr.clone_to(a, b, replica_id=2)
         assert crr_from(b) == Crr(tbls={}, ctx={1: 0, 2: 0}, log=set())
 
 
 def test_pull_from(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
+    path_a = tmp_path / "a.db"
+    with closing(sqlite3.connect(path_a)) as a, closing(
+        sqlite3.connect(tmp_path / "b.db")
     ) as b:
         execute(a, "PRAGMA foreign_keys=ON")
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-
+        execute(a, "CREATE TABLE X(x integer PRIMARY KEY, v text)")
+        crr.init(a, replica_id=1, conf=DEFAULT_CONF)
         crr.clone_to(a, b, replica_id=2)
-        crr.pull_from(b, tmp_path / "a.db")
-        assert crr_from(b) == Crr(tbls={}, ctx={1: 0, 2: 0}, log=set())
 
+        execute(a, "INSERT INTO X VALUES(1, 'v1')")
+        a.commit()
+        crr.pull_from(b, str(path_a))
+        assert crr_from(b) == Crr(
+            tbls={"X": {(1, "v1", (1, 1))}},
+            ctx={1: 1, 2: 0},
+            log={Val(ts=(1, 1), row=(1, 1), name="v", val="v1")},
+        )
 
-def test_pull_aliased_rowid(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x integer PRIMARY KEY);")
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        crr.clone_to(a, b, replica_id=2)
+
+def test_pull_aliased_rowid(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(connect(mem_uri("b"))) as b:
+        crr_init_clone(a, b, "CREATE TABLE X(x integer PRIMARY KEY)")
 
         execute(a, "INSERT INTO X VALUES(1)")
-        crr.pull_from(b, tmp_path / "a.db")
+        crr_pull_from(b, a)
         assert crr_from(b) == Crr(
             tbls={"X": {(1, (1, 1))}},
             ctx={1: 1, 2: 0},
@@ -376,7 +368,7 @@ def test_pull_aliased_rowid(tmp_path: pathlib.Path) -> None:
         )
 
         execute(a, "UPDATE X SET x = 2")
-        crr.pull_from(b, tmp_path / "a.db")
+        crr_pull_from(b, a)
         assert crr_from(b) == Crr(
             tbls={"X": {(1, (1, 1))}},  # x does not change on b
             ctx={1: 1, 2: 0},
@@ -384,7 +376,7 @@ def test_pull_aliased_rowid(tmp_path: pathlib.Path) -> None:
         )
 
         execute(a, "DELETE FROM X")
-        crr.pull_from(b, tmp_path / "a.db")
+        crr_pull_from(b, a)
         assert crr_from(b) == Crr(
             tbls={"X": set()},
             ctx={1: 2, 2: 0},
@@ -393,17 +385,14 @@ def test_pull_aliased_rowid(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_pull_repl_col(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x integer PRIMARY KEY AUTOINCREMENT, v text)")
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        crr.clone_to(a, b, replica_id=2)
+def test_pull_repl_col(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(connect(mem_uri("b"))) as b:
+        crr_init_clone(
+            a, b, "CREATE TABLE X(x integer PRIMARY KEY AUTOINCREMENT, v text)"
+        )
 
         execute(a, "INSERT INTO X(v) VALUES('v1')")
-        crr.pull_from(b, tmp_path / "a.db")
+        crr_pull_from(b, a)
         assert crr_from(b) == Crr(
             tbls={"X": {(1, "v1", (1, 1))}},
             ctx={1: 1, 2: 0},
@@ -411,7 +400,7 @@ def test_pull_repl_col(tmp_path: pathlib.Path) -> None:
         )
 
         execute(a, "UPDATE X SET v = 'v2'")
-        crr.pull_from(b, tmp_path / "a.db")
+        crr_pull_from(b, a)
         assert crr_from(b) == Crr(
             tbls={"X": {(1, "v2", (1, 1))}},
             ctx={1: 2, 2: 0},
@@ -423,22 +412,21 @@ def test_pull_repl_col(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_pull_fk_aliased_rowid(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x integer PRIMARY KEY)")
-        execute(
+def test_pull_fk_aliased_rowid(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(connect(mem_uri("b"))) as b:
+        crr_init_clone(
             a,
-            "CREATE TABLE Y(y integer PRIMARY KEY, x integer CONSTRAINT fk REFERENCES X(x))",
+            b,
+            """
+            CREATE TABLE X(x integer PRIMARY KEY);
+            CREATE TABLE Y(y integer PRIMARY KEY, x integer CONSTRAINT fk REFERENCES X(x));
+            """,
         )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        crr.clone_to(a, b, replica_id=2)
 
-        execute(a, "INSERT INTO X VALUES(1)")
-        execute(a, "INSERT INTO Y VALUES(1, 1)")
-        crr.pull_from(b, tmp_path / "a.db")
+        with transaction(a):
+            execute(a, "INSERT INTO X VALUES(1)")
+            execute(a, "INSERT INTO Y VALUES(1, 1)")
+        crr_pull_from(b, a)
         assert crr_from(b) == Crr(
             tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 1))}},
             ctx={1: 2, 2: 0},
@@ -447,9 +435,10 @@ def test_pull_fk_aliased_rowid(tmp_path: pathlib.Path) -> None:
             },
         )
 
-        execute(a, "INSERT INTO X VALUES(2)")
-        execute(a, "UPDATE Y SET x = 2")
-        crr.pull_from(b, tmp_path / "a.db")
+        with transaction(a):
+            execute(a, "INSERT INTO X VALUES(2)")
+            execute(a, "UPDATE Y SET x = 2")
+        crr_pull_from(b, a)
         assert crr_from(b) == Crr(
             tbls={
                 "X": {
@@ -469,21 +458,23 @@ def test_pull_fk_aliased_rowid(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_pull_fk_fk(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x int PRIMARY KEY)")
-        execute(a, "CREATE TABLE Y(y integer PRIMARY KEY CONSTRAINT fk1 REFERENCES X)")
-        execute(a, "CREATE TABLE Z(z integer PRIMARY KEY CONSTRAINT fk2 REFERENCES Y)")
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        crr.clone_to(a, b, replica_id=2)
-
-        execute(a, "INSERT INTO X VALUES(1)")
-        execute(a, "INSERT INTO Y VALUES(1)")
-        execute(a, "INSERT INTO Z VALUES(1)")
-        crr.pull_from(b, tmp_path / "a.db")
+def test_pull_fk_fk(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(connect(mem_uri("b"))) as b:
+        crr_init_clone(
+            a,
+            b,
+            """
+            CREATE TABLE X(x int PRIMARY KEY);
+            CREATE TABLE Y(y integer PRIMARY KEY CONSTRAINT fk1 REFERENCES X);
+            CREATE TABLE Z(z integer PRIMARY KEY CONSTRAINT fk2 REFERENCES Y);
+            """,
+        )
+
+        with transaction(a):
+            execute(a, "INSERT INTO X VALUES(1)")
+            execute(a, "INSERT INTO Y VALUES(1)")
+            execute(a, "INSERT INTO Z VALUES(1)")
+        crr_pull_from(b, a)
         assert crr_from(b) == Crr(
             tbls={
                 "X": {
@@ -506,18 +497,13 @@ def test_pull_fk_fk(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_concur_ins_aliased_rowid(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(rowid integer PRIMARY KEY);")
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        crr.clone_to(a, b, replica_id=2)
+def test_concur_ins_aliased_rowid(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(connect(mem_uri("b"))) as b:
+        crr_init_clone(a, b, "CREATE TABLE X(rowid integer PRIMARY KEY)")
         execute(a, "INSERT INTO X VALUES(1)")
         execute(b, "INSERT INTO X VALUES(1)")
 
-        crr.pull_from(a, tmp_path / "b.db")
+        crr_pull_from(a, b)
         assert crr_from(a) == Crr(
             tbls={
                 "X": {
@@ -529,7 +515,7 @@ def test_concur_ins_aliased_rowid(tmp_path: pathlib.Path) -> None:
             log=set(),
         )
 
-        crr.pull_from(b, tmp_path / "a.db")
+        crr_pull_from(b, a)
         assert crr_from(b) == Crr(
             tbls={
                 "X": {
@@ -543,18 +529,13 @@ def test_concur_ins_aliased_rowid(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_concur_ins_repl_col(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(v text PRIMARY KEY);")
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        crr.clone_to(a, b, replica_id=2)
+def test_concur_ins_repl_col(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(connect(mem_uri("b"))) as b:
+        crr_init_clone(a, b, "CREATE TABLE X(v text PRIMARY KEY)")
         execute(a, "INSERT INTO X VALUES('a1')")
         execute(b, "INSERT INTO X VALUES('b1')")
 
-        crr.pull_from(a, tmp_path / "b.db")
+        crr_pull_from(a, b)
         assert crr_from(a) == Crr(
             tbls={
                 "X": {
@@ -569,10 +550,10 @@ def test_concur_ins_repl_col(tmp_path: pathlib.Path) -> None:
             },
         )
 
-        crr.pull_from(b, tmp_path / "a.db")
+        crr_pull_from(b, a)
         execute(a, "UPDATE X SET v = 'a2' WHERE v = 'a1'")
         execute(b, "UPDATE X SET v = 'b2' WHERE v = 'a1'")
-        crr.pull_from(a, tmp_path / "b.db")
+        crr_pull_from(a, b)
         assert crr_from(a) == Crr(
             tbls={
                 "X": {
@@ -591,55 +572,61 @@ def test_concur_ins_repl_col(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_conflicting_keys(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "b.bak.db") as b_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(v text PRIMARY KEY);")
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        crr.clone_to(a, b, replica_id=2)
+@pytest.mark.parametrize(
+    "puller, expected",
+    [
+        (
+            "a",
+            Crr(
+                tbls={"X": {("v1", (1, 1))}},
+                ctx={1: 2, 2: 1},
+                log={
+                    Val(ts=(1, 1), row=(1, 1), name="v", val="v1"),
+                    Val(ts=(1, 2), row=(1, 2), name="v", val="v1"),
+                    Undo(ts=(2, 1), obj=(1, 2), ul=1),
+                },
+            ),
+        ),
+        (
+            "b",
+            Crr(
+                tbls={"X": {("v1", (1, 1))}},
+                ctx={1: 1, 2: 2},
+                log={
+                    Val(ts=(1, 1), row=(1, 1), name="v", val="v1"),
+                    Val(ts=(1, 2), row=(1, 2), name="v", val="v1"),
+                    Undo(ts=(2, 2), obj=(1, 2), ul=1),
+                },
+            ),
+        ),
+    ],
+    ids=["a_pulls", "b_pulls"],
+)
+def test_conflicting_keys(
+    mem_uri: typing.Callable[[str], str], puller: str, expected: Crr
+) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(connect(mem_uri("b"))) as b:
+        crr_init_clone(a, b, "CREATE TABLE X(v text PRIMARY KEY)")
         execute(a, "INSERT INTO X VALUES('v1')")
         execute(b, "INSERT INTO X VALUES('v1')")
-        b.backup(b_bak)
-
-        crr.pull_from(b, tmp_path / "a.db")
-        assert crr_from(b) == Crr(
-            tbls={"X": {("v1", (1, 1))}},
-            ctx={1: 1, 2: 2},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="v", val="v1"),
-                Val(ts=(1, 2), row=(1, 2), name="v", val="v1"),
-                Undo(ts=(2, 2), obj=(1, 2), ul=1),
-            },
-        )
 
-        crr.pull_from(a, tmp_path / "b.bak.db")
-        assert crr_from(a) == Crr(
-            tbls={"X": {("v1", (1, 1))}},
-            ctx={1: 2, 2: 1},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="v", val="v1"),
-                Val(ts=(1, 2), row=(1, 2), name="v", val="v1"),
-                Undo(ts=(2, 1), obj=(1, 2), ul=1),
-            },
-        )
-        execute(a, "PRAGMA integrity_check")
+        db = crr_pull_by(puller, a, b)
+        assert crr_from(db) == expected
+        execute(db, "PRAGMA integrity_check")
 
 
-def test_unique_nulls(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "b.bak.db") as b_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x integer PRIMARY KEY AUTOINCREMENT, v int UNIQUE);")
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        crr.clone_to(a, b, replica_id=2)
+def test_unique_nulls(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(
+        connect(mem_uri("b"))
+    ) as b, closing(connect(mem_uri("b_bak"))) as b_bak:
+        crr_init_clone(
+            a, b, "CREATE TABLE X(x integer PRIMARY KEY AUTOINCREMENT, v int UNIQUE)"
+        )
         execute(a, "INSERT INTO X(v) VALUES(NULL)")
         execute(b, "INSERT INTO X(v) VALUES(NULL)")
         b.backup(b_bak)
 
-        crr.pull_from(b, tmp_path / "a.db")
+        crr_pull_from(b, a)
         assert crr_from(b) == Crr(
             tbls={"X": {(2, None, (1, 1)), (1, None, (1, 2))}},
             ctx={1: 1, 2: 1},
@@ -649,7 +636,7 @@ def test_unique_nulls(tmp_path: pathlib.Path) -> None:
             },
         )
 
-        crr.pull_from(a, tmp_path / "b.bak.db")
+        crr_pull_from(a, b_bak)
         assert crr_from(a) == Crr(
             tbls={"X": {(1, None, (1, 1)), (2, None, (1, 2))}},
             ctx={1: 1, 2: 1},
@@ -661,21 +648,18 @@ def test_unique_nulls(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_multi_col_conflicting_keys(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "b.bak.db") as b_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(a integer, b integer, PRIMARY KEY(a, b));")
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        crr.clone_to(a, b, replica_id=2)
-        execute(a, "INSERT INTO X VALUES(1, 2)")
-        execute(a, "INSERT INTO X VALUES(1, 3)")
-        execute(b, "INSERT INTO X VALUES(1, 2)")
-        execute(b, "INSERT INTO X VALUES(1, 4)")
+def test_multi_col_conflicting_keys(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(
+        connect(mem_uri("b"))
+    ) as b, closing(connect(mem_uri("b_bak"))) as b_bak:
+        crr_init_clone(a, b, "CREATE TABLE X(a integer, b integer, PRIMARY KEY(a, b))")
+        with transaction(a):
+            execute_many(a, "INSERT INTO X VALUES(?, ?)", [(1, 2), (1, 3)])
+        with transaction(b):
+            execute_many(b, "INSERT INTO X VALUES(?, ?)", [(1, 2), (1, 4)])
         b.backup(b_bak)
 
-        crr.pull_from(b, tmp_path / "a.db")
+        crr_pull_from(b, a)
         assert crr_from(b) == Crr(
             tbls={"X": {(1, 2, (1, 1)), (1, 3, (2, 1)), (1, 4, (2, 2))}},
             ctx={1: 2, 2: 3},
@@ -692,7 +676,7 @@ def test_multi_col_conflicting_keys(tmp_path: pathlib.Path) -> None:
             },
         )
 
-        crr.pull_from(a, tmp_path / "b.bak.db")
+        crr_pull_from(a, b_bak)
         assert crr_from(a) == Crr(
             tbls={"X": {(1, 2, (1, 1)), (1, 3, (2, 1)), (1, 4, (2, 2))}},
             ctx={1: 3, 2: 2},
@@ -711,21 +695,18 @@ def test_multi_col_conflicting_keys(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_multi_col_multi_covering_unique(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "b.bak.db") as b_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(
-            a, "CREATE TABLE X(a int, b int, c int, PRIMARY KEY(a,b), UNIQUE(b,c));"
+def test_multi_col_multi_covering_unique(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(
+        connect(mem_uri("b"))
+    ) as b, closing(connect(mem_uri("b_bak"))) as b_bak:
+        crr_init_clone(
+            a, b, "CREATE TABLE X(a int, b int, c int, PRIMARY KEY(a,b), UNIQUE(b,c))"
         )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        crr.clone_to(a, b, replica_id=2)
         execute(a, "INSERT INTO X VALUES(1, 2, 3)")
         execute(b, "INSERT INTO X VALUES(1, 4, 3)")
         b.backup(b_bak)
 
-        crr.pull_from(b, tmp_path / "a.db")
+        crr_pull_from(b, a)
         assert crr_from(b) == Crr(
             tbls={"X": {(1, 2, 3, (1, 1)), (1, 4, 3, (1, 2))}},
             ctx={1: 1, 2: 1},
@@ -739,7 +720,7 @@ def test_multi_col_multi_covering_unique(tmp_path: pathlib.Path) -> None:
             },
         )
 
-        crr.pull_from(a, tmp_path / "b.bak.db")
+        crr_pull_from(a, b_bak)
         assert crr_from(a) == Crr(
             tbls={"X": {(1, 2, 3, (1, 1)), (1, 4, 3, (1, 2))}},
             ctx={1: 1, 2: 1},
@@ -755,21 +736,24 @@ def test_multi_col_multi_covering_unique(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_conflicting_unique_fk(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "b.bak.db") as b_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x int PRIMARY KEY);")
-        execute(a, "CREATE TABLE Y(x int CONSTRAINT fk REFERENCES X(x) PRIMARY KEY);")
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        execute(a, "INSERT INTO X VALUES(1)")
-        crr.clone_to(a, b, replica_id=2)
+def test_conflicting_unique_fk(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(
+        connect(mem_uri("b"))
+    ) as b, closing(connect(mem_uri("b_bak"))) as b_bak:
+        crr_init_clone(
+            a,
+            b,
+            """
+            CREATE TABLE X(x int PRIMARY KEY);
+            CREATE TABLE Y(x int CONSTRAINT fk REFERENCES X(x) PRIMARY KEY);
+            """,
+            seed="INSERT INTO X VALUES(1)",
+        )
         execute(a, "INSERT INTO Y VALUES(1)")
         execute(b, "INSERT INTO Y VALUES(1)")
         b.backup(b_bak)
 
-        crr.pull_from(b, tmp_path / "a.db")
+        crr_pull_from(b, a)
         assert crr_from(b) == Crr(
             tbls={"X": {(1, (1, 1))}, "Y": {(1, (2, 1))}},
             ctx={1: 2, 2: 3},
@@ -781,7 +765,7 @@ def test_conflicting_unique_fk(tmp_path: pathlib.Path) -> None:
             },
         )
 
-        crr.pull_from(a, tmp_path / "b.bak.db")
+        crr_pull_from(a, b_bak)
         assert crr_from(a) == Crr(
             tbls={"X": {(1, (1, 1))}, "Y": {(1, (2, 1))}},
             ctx={1: 3, 2: 2},
@@ -795,25 +779,27 @@ def test_conflicting_unique_fk(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_multi_col_fk_multi_covering_unique(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "b.bak.db") as b_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x int PRIMARY KEY);")
-        execute(
+def test_multi_col_fk_multi_covering_unique(
+    mem_uri: typing.Callable[[str], str]
+) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(
+        connect(mem_uri("b"))
+    ) as b, closing(connect(mem_uri("b_bak"))) as b_bak:
+        crr_init_clone(
             a,
-            "CREATE TABLE Y(y int PRIMARY KEY, x int CONSTRAINT fk REFERENCES X(x), UNIQUE(y, x));",
+            b,
+            """
+            CREATE TABLE X(x int PRIMARY KEY);
+            CREATE TABLE Y(y int PRIMARY KEY, x int CONSTRAINT fk REFERENCES X(x), UNIQUE(y, x));
+            """,
+            seed="INSERT INTO X VALUES(1)",
         )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        execute(a, "INSERT INTO X VALUES(1)")
-        crr.clone_to(a, b, replica_id=2)
         execute(a, "INSERT INTO Y VALUES(1, 1)")
-        execute(b, "INSERT INTO Y VALUES(1, 1)")
-        execute(b, "INSERT INTO Y VALUES(2, 1)")
+        with transaction(b):
+            execute_many(b, "INSERT INTO Y VALUES(?, ?)", [(1, 1), (2, 1)])
         b.backup(b_bak)
 
-        crr.pull_from(b, tmp_path / "a.db")
+        crr_pull_from(b, a)
         assert crr_from(b) == Crr(
             tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 1)), (2, 1, (3, 2))}},
             ctx={1: 2, 2: 4},
@@ -829,7 +815,7 @@ def test_multi_col_fk_multi_covering_unique(tmp_path: pathlib.Path) -> None:
             },
         )
 
-        crr.pull_from(a, tmp_path / "b.bak.db")
+        crr_pull_from(a, b_bak)
         assert crr_from(a) == Crr(
             tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 1)), (2, 1, (3, 2))}},
             ctx={1: 4, 2: 3},
@@ -847,20 +833,18 @@ def test_multi_col_fk_multi_covering_unique(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_past_conflicting_keys(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "b.bak.db") as b_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(v text PRIMARY KEY);")
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        crr.clone_to(a, b, replica_id=2)
-        execute(a, "INSERT INTO X VALUES('v1')")
-        execute(a, "UPDATE X SET v = 'v2'")
+def test_past_conflicting_keys(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(
+        connect(mem_uri("b"))
+    ) as b, closing(connect(mem_uri("b_bak"))) as b_bak:
+        crr_init_clone(a, b, "CREATE TABLE X(v text PRIMARY KEY)")
+        with transaction(a):
+            execute(a, "INSERT INTO X VALUES('v1')")
+            execute(a, "UPDATE X SET v = 'v2'")
         execute(b, "INSERT INTO X VALUES('v1')")
         b.backup(b_bak)
 
-        crr.pull_from(b, tmp_path / "a.db")
+        crr_pull_from(b, a)
         assert crr_from(b) == Crr(
             tbls={"X": {("v2", (1, 1)), ("v1", (1, 2))}},
             ctx={1: 2, 2: 1},
@@ -871,7 +855,7 @@ def test_past_conflicting_keys(tmp_path: pathlib.Path) -> None:
             },
         )
 
-        crr.pull_from(a, tmp_path / "b.bak.db")
+        crr_pull_from(a, b_bak)
         assert crr_from(a) == Crr(
             tbls={"X": {("v2", (1, 1)), ("v1", (1, 2))}},
             ctx={1: 2, 2: 1},
@@ -884,20 +868,17 @@ def test_past_conflicting_keys(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_conflicting_3keys(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "b.bak.db") as b_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(u text PRIMARY KEY, v text UNIQUE);")
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        crr.clone_to(a, b, replica_id=2)
-        execute(a, "INSERT INTO X VALUES('u1', 'v1')")
-        execute(a, "INSERT INTO X VALUES('u2', 'v2')")
+def test_conflicting_3keys(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(
+        connect(mem_uri("b"))
+    ) as b, closing(connect(mem_uri("b_bak"))) as b_bak:
+        crr_init_clone(a, b, "CREATE TABLE X(u text PRIMARY KEY, v text UNIQUE)")
+        with transaction(a):
+            execute_many(a, "INSERT INTO X VALUES(?, ?)", [("u1", "v1"), ("u2", "v2")])
         execute(b, "INSERT INTO X VALUES('u1', 'v2')")
         b.backup(b_bak)
 
-        crr.pull_from(b, tmp_path / "a.db")
+        crr_pull_from(b, a)
         assert crr_from(b) == Crr(
             tbls={"X": {("u1", "v1", (1, 1))}},
             ctx={1: 2, 2: 3},
@@ -913,7 +894,7 @@ def test_conflicting_3keys(tmp_path: pathlib.Path) -> None:
             },
         )
 
-        crr.pull_from(a, tmp_path / "b.bak.db")
+        crr_pull_from(a, b_bak)
         assert crr_from(a) == Crr(
             tbls={"X": {("u1", "v1", (1, 1))}},
             ctx={1: 3, 2: 1},
@@ -931,71 +912,82 @@ def test_conflicting_3keys(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_concur_del_fk_restrict_aliased_rowid(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "a.bak.db") as a_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x integer PRIMARY KEY)")
-        execute(
+@pytest.mark.parametrize(
+    "puller, expected",
+    [
+        (
+            "a",
+            Crr(
+                tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 2))}},
+                ctx={1: 3, 2: 2},
+                log={
+                    Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
+                    Undo(ts=(3, 1), obj=(1, 1), ul=2),
+                },
+            ),
+        ),
+        (
+            "b",
+            Crr(
+                tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 2))}},
+                ctx={1: 2, 2: 3},
+                log={
+                    Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
+                    Undo(ts=(3, 2), obj=(1, 1), ul=2),
+                },
+            ),
+        ),
+    ],
+    ids=["a_pulls", "b_pulls"],
+)
+def test_concur_del_fk_restrict_aliased_rowid(
+    mem_uri: typing.Callable[[str], str], puller: str, expected: Crr
+) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(connect(mem_uri("b"))) as b:
+        crr_init_clone(
             a,
-            """CREATE TABLE Y(
+            b,
+            """
+            CREATE TABLE X(x integer PRIMARY KEY);
+            CREATE TABLE Y(
                 y integer PRIMARY KEY,
                 x integer CONSTRAINT fk REFERENCES X(x) ON DELETE RESTRICT
-            )""",
+            );
+            """,
+            seed="INSERT INTO X VALUES(1)",
         )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        execute(a, "INSERT INTO X VALUES(1)")
-        crr.clone_to(a, b, replica_id=2)
         execute(a, "DELETE FROM X")
-        a.backup(a_bak)
         execute(b, "INSERT INTO Y VALUES(1, 1)")
 
-        crr.pull_from(a, tmp_path / "b.db")
-        assert crr_from(a) == Crr(
-            tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 2))}},
-            ctx={1: 3, 2: 2},
-            log={
-                Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
-                Undo(ts=(3, 1), obj=(1, 1), ul=2),
-            },
-        )
-
-        crr.pull_from(b, tmp_path / "a.bak.db")
-        assert crr_from(b) == Crr(
-            tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 2))}},
-            ctx={1: 2, 2: 3},
-            log={
-                Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
-                Undo(ts=(3, 2), obj=(1, 1), ul=2),
-            },
-        )
-        execute(a, "PRAGMA integrity_check")
+        db = crr_pull_by(puller, a, b)
+        assert crr_from(db) == expected
+        execute(db, "PRAGMA integrity_check")
 
 
-def test_concur_past_del_fk_restrict(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "a.bak.db") as a_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x integer PRIMARY KEY)")
-        execute(
+def test_concur_past_del_fk_restrict(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(
+        connect(mem_uri("b"))
+    ) as b, closing(connect(mem_uri("a_bak"))) as a_bak:
+        crr_init_clone(
             a,
-            """CREATE TABLE Y(
+            b,
+            """
+            CREATE TABLE X(x integer PRIMARY KEY);
+            CREATE TABLE Y(
                 y integer PRIMARY KEY,
                 x integer CONSTRAINT fk REFERENCES X(x) ON DELETE RESTRICT
-            )""",
+            );
+            """,
+            seed="INSERT INTO X VALUES(1)",
         )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        execute(a, "INSERT INTO X VALUES(1)")
-        crr.clone_to(a, b, replica_id=2)
         execute(a, "DELETE FROM X")
         a.backup(a_bak)
-        execute(b, "INSERT INTO Y VALUES(1, 1)")
-        execute(b, "INSERT INTO X VALUES(2)")
-        execute(b, "UPDATE Y SET x = 2")
+        with transaction(b):
+            execute(b, "INSERT INTO Y VALUES(1, 1)")
+            execute(b, "INSERT INTO X VALUES(2)")
+            execute(b, "UPDATE Y SET x = 2")
 
-        crr.pull_from(a, tmp_path / "b.db")
+        crr_pull_from(a, b)
         assert crr_from(a) == Crr(
             tbls={"X": {(1, (3, 2))}, "Y": {(1, 1, (2, 2))}},
             ctx={1: 2, 2: 4},
@@ -1006,7 +998,7 @@ def test_concur_past_del_fk_restrict(tmp_path: pathlib.Path) -> None:
             },
         )
 
-        crr.pull_from(b, tmp_path / "a.bak.db")
+        crr_pull_from(b, a_bak)
         assert crr_from(b) == Crr(
             tbls={"X": {(2, (3, 2))}, "Y": {(1, 2, (2, 2))}},
             ctx={1: 2, 2: 4},
@@ -1019,27 +1011,27 @@ def test_concur_past_del_fk_restrict(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_concur_del_fk_restrict_repl_pk(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "a.bak.db") as a_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x int PRIMARY KEY)")
-        execute(
+def test_concur_del_fk_restrict_repl_pk(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(
+        connect(mem_uri("b"))
+    ) as b, closing(connect(mem_uri("a_bak"))) as a_bak:
+        crr_init_clone(
             a,
-            """CREATE TABLE Y(
+            b,
+            """
+            CREATE TABLE X(x int PRIMARY KEY);
+            CREATE TABLE Y(
                 y integer PRIMARY KEY,
                 x integer CONSTRAINT fk REFERENCES X(x) ON DELETE RESTRICT
-            )""",
+            );
+            """,
+            seed="INSERT INTO X VALUES(1)",
         )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        execute(a, "INSERT INTO X VALUES(1)")
-        crr.clone_to(a, b, replica_id=2)
         execute(a, "DELETE FROM X")
         a.backup(a_bak)
         execute(b, "INSERT INTO Y VALUES(1, 1)")
 
-        crr.pull_from(a, tmp_path / "b.db")
+        crr_pull_from(a, b)
         assert crr_from(a) == Crr(
             tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 2))}},
             ctx={1: 3, 2: 2},
@@ -1050,7 +1042,7 @@ def test_concur_del_fk_restrict_repl_pk(tmp_path: pathlib.Path) -> None:
             },
         )
 
-        crr.pull_from(b, tmp_path / "a.bak.db")
+        crr_pull_from(b, a_bak)
         assert crr_from(b) == Crr(
             tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 2))}},
             ctx={1: 2, 2: 3},
@@ -1063,35 +1055,33 @@ def test_concur_del_fk_restrict_repl_pk(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_concur_del_fk_restrict_rec(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "a.bak.db") as a_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x integer PRIMARY KEY)")
-        execute(
+def test_concur_del_fk_restrict_rec(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(
+        connect(mem_uri("b"))
+    ) as b, closing(connect(mem_uri("a_bak"))) as a_bak:
+        crr_init_clone(
             a,
-            """CREATE TABLE Y(
+            b,
+            """
+            CREATE TABLE X(x integer PRIMARY KEY);
+            CREATE TABLE Y(
                 y integer PRIMARY KEY,
                 x integer CONSTRAINT fk1 REFERENCES X(x) ON DELETE CASCADE
-            )""",
-        )
-        execute(
-            a,
-            """CREATE TABLE Z(
+            );
+            CREATE TABLE Z(
                 z integer PRIMARY KEY,
                 y integer CONSTRAINT fk2 REFERENCES Y(y) ON DELETE RESTRICT
-            )""",
+            );
+            """,
+            seed="INSERT INTO X VALUES(1)",
         )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        execute(a, "INSERT INTO X VALUES(1)")
-        crr.clone_to(a, b, replica_id=2)
         execute(a, "DELETE FROM X")
         a.backup(a_bak)
-        execute(b, "INSERT INTO Y VALUES(1, 1)")
-        execute(b, "INSERT INTO Z VALUES(1, 1)")
+        with transaction(b):
+            execute(b, "INSERT INTO Y VALUES(1, 1)")
+            execute(b, "INSERT INTO Z VALUES(1, 1)")
 
-        crr.pull_from(a, tmp_path / "b.db")
+        crr_pull_from(a, b)
         assert crr_from(a) == Crr(
             tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 2))}, "Z": {(1, 1, (3, 2))}},
             ctx={1: 4, 2: 3},
@@ -1102,7 +1092,7 @@ def test_concur_del_fk_restrict_rec(tmp_path: pathlib.Path) -> None:
             },
         )
 
-        crr.pull_from(b, tmp_path / "a.bak.db")
+        crr_pull_from(b, a_bak)
         assert crr_from(b) == Crr(
             tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 2))}, "Z": {(1, 1, (3, 2))}},
             ctx={1: 2, 2: 4},
@@ -1115,114 +1105,134 @@ def test_concur_del_fk_restrict_rec(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_concur_del_fk_cascade(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "a.bak.db") as a_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x integer PRIMARY KEY)")
-        execute(
+@pytest.mark.parametrize(
+    "puller, expected",
+    [
+        (
+            "a",
+            Crr(
+                tbls={"X": set(), "Y": set()},
+                ctx={1: 3, 2: 2},
+                log={
+                    Undo(ts=(2, 1), obj=(1, 1), ul=1),
+                    Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
+                    Undo(ts=(3, 1), obj=(2, 2), ul=1),
+                },
+            ),
+        ),
+        (
+            "b",
+            Crr(
+                tbls={"X": set(), "Y": set()},
+                ctx={1: 2, 2: 3},
+                log={
+                    Undo(ts=(2, 1), obj=(1, 1), ul=1),
+                    Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
+                    Undo(ts=(3, 2), obj=(2, 2), ul=1),
+                },
+            ),
+        ),
+    ],
+    ids=["a_pulls", "b_pulls"],
+)
+def test_concur_del_fk_cascade(
+    mem_uri: typing.Callable[[str], str], puller: str, expected: Crr
+) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(connect(mem_uri("b"))) as b:
+        crr_init_clone(
             a,
-            """CREATE TABLE Y(
+            b,
+            """
+            CREATE TABLE X(x integer PRIMARY KEY);
+            CREATE TABLE Y(
                 y integer PRIMARY KEY,
                 x integer CONSTRAINT fk REFERENCES X(x) ON DELETE CASCADE
-            )""",
+            );
+            """,
+            seed="INSERT INTO X VALUES(1)",
         )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        execute(a, "INSERT INTO X VALUES(1)")
-        crr.clone_to(a, b, replica_id=2)
         execute(a, "DELETE FROM X")
-        a.backup(a_bak)
         execute(b, "INSERT INTO Y VALUES(1, 1)")
 
-        crr.pull_from(a, tmp_path / "b.db")
-        assert crr_from(a) == Crr(
-            tbls={"X": set(), "Y": set()},
-            ctx={1: 3, 2: 2},
-            log={
-                Undo(ts=(2, 1), obj=(1, 1), ul=1),
-                Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
-                Undo(ts=(3, 1), obj=(2, 2), ul=1),
-            },
-        )
-
-        crr.pull_from(b, tmp_path / "a.bak.db")
-        assert crr_from(b) == Crr(
-            tbls={"X": set(), "Y": set()},
-            ctx={1: 2, 2: 3},
-            log={
-                Undo(ts=(2, 1), obj=(1, 1), ul=1),
-                Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
-                Undo(ts=(3, 2), obj=(2, 2), ul=1),
-            },
-        )
-        execute(a, "PRAGMA integrity_check")
-
-
-def test_concur_del_fk_set_null(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "a.bak.db") as a_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x integer PRIMARY KEY)")
-        execute(
+        db = crr_pull_by(puller, a, b)
+        assert crr_from(db) == expected
+        execute(db, "PRAGMA integrity_check")
+
+
+@pytest.mark.parametrize(
+    "puller, expected",
+    [
+        (
+            "a",
+            Crr(
+                tbls={"X": set(), "Y": {(1, None, (2, 2))}},
+                ctx={1: 2, 2: 2},
+                log={
+                    Undo(ts=(2, 1), obj=(1, 1), ul=1),
+                    Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
+                },
+            ),
+        ),
+        (
+            "b",
+            Crr(
+                tbls={"X": set(), "Y": {(1, None, (2, 2))}},
+                ctx={1: 2, 2: 2},
+                log={
+                    Undo(ts=(2, 1), obj=(1, 1), ul=1),
+                    Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
+                },
+            ),
+        ),
+    ],
+    ids=["a_pulls", "b_pulls"],
+)
+def test_concur_del_fk_set_null(
+    mem_uri: typing.Callable[[str], str], puller: str, expected: Crr
+) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(connect(mem_uri("b"))) as b:
+        crr_init_clone(
             a,
-            """CREATE TABLE Y(
+            b,
+            """
+            CREATE TABLE X(x integer PRIMARY KEY);
+            CREATE TABLE Y(
                 y integer PRIMARY KEY,
                 x integer CONSTRAINT fk REFERENCES X ON DELETE SET NULL
-            )""",
+            );
+            """,
+            seed="INSERT INTO X VALUES(1)",
         )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        execute(a, "INSERT INTO X VALUES(1)")
-        crr.clone_to(a, b, replica_id=2)
         execute(a, "DELETE FROM X")
-        a.backup(a_bak)
         execute(b, "INSERT INTO Y VALUES(1, 1)")
 
-        crr.pull_from(a, tmp_path / "b.db")
-        assert crr_from(a) == Crr(
-            tbls={"X": set(), "Y": {(1, None, (2, 2))}},
-            ctx={1: 2, 2: 2},
-            log={
-                Undo(ts=(2, 1), obj=(1, 1), ul=1),
-                Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
-            },
-        )
-
-        crr.pull_from(b, tmp_path / "a.bak.db")
-        assert crr_from(b) == Crr(
-            tbls={"X": set(), "Y": {(1, None, (2, 2))}},
-            ctx={1: 2, 2: 2},
-            log={
-                Undo(ts=(2, 1), obj=(1, 1), ul=1),
-                Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
-            },
-        )
-        execute(a, "PRAGMA integrity_check")
+        db = crr_pull_by(puller, a, b)
+        assert crr_from(db) == expected
+        execute(db, "PRAGMA integrity_check")
 
 
-def test_concur_del_fk_set_null_repl_col(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "a.bak.db") as a_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x int PRIMARY KEY)")
-        execute(
+def test_concur_del_fk_set_null_repl_col(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(
+        connect(mem_uri("b"))
+    ) as b, closing(connect(mem_uri("a_bak"))) as a_bak:
+        crr_init_clone(
             a,
-            """CREATE TABLE Y(
+            b,
+            """
+            CREATE TABLE X(x int PRIMARY KEY);
+            CREATE TABLE Y(
                 y integer PRIMARY KEY,
                 x int CONSTRAINT fk REFERENCES X ON DELETE SET NULL
-            )""",
+            );
+            """,
+            seed="INSERT INTO X VALUES(1)",
         )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        execute(a, "INSERT INTO X VALUES(1)")
-        crr.clone_to(a, b, replica_id=2)
         execute(a, "DELETE FROM X")
         a.backup(a_bak)
         execute(b, "INSERT INTO Y VALUES(1, 1)")
 
         execute(a, "PRAGMA foreign_keys=OFF")
-        crr.pull_from(a, tmp_path / "b.db")
+        crr_pull_from(a, b)
         assert crr_from(a) == Crr(
             tbls={"X": set(), "Y": {(1, None, (2, 2))}},
             ctx={1: 2, 2: 2},
@@ -1233,7 +1243,7 @@ def test_concur_del_fk_set_null_repl_col(tmp_path: pathlib.Path) -> None:
             },
         )
 
-        crr.pull_from(b, tmp_path / "a.bak.db")
+        crr_pull_from(b, a_bak)
         assert crr_from(b) == Crr(
             tbls={"X": set(), "Y": {(1, None, (2, 2))}},
             ctx={1: 2, 2: 2},
@@ -1246,74 +1256,151 @@ def test_concur_del_fk_set_null_repl_col(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_concur_up_fk_restrict(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "a.bak.db") as a_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x int PRIMARY KEY)")
-        execute(
+@pytest.mark.parametrize(
+    "action, puller, expected",
+    [
+        (
+            "RESTRICT",
+            "a",
+            Crr(
+                tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 2))}},
+                ctx={1: 3, 2: 2},
+                log={
+                    Val(ts=(1, 1), row=(1, 1), name="x", val=1),
+                    Val(ts=(2, 1), row=(1, 1), name="x", val=2),
+                    Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
+                    Undo(ts=(3, 1), obj=(2, 1), ul=1),
+                },
+            ),
+        ),
+        (
+            "RESTRICT",
+            "b",
+            Crr(
+                tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 2))}},
+                ctx={1: 2, 2: 3},
+                log={
+                    Val(ts=(1, 1), row=(1, 1), name="x", val=1),
+                    Val(ts=(2, 1), row=(1, 1), name="x", val=2),
+                    Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
+                    Undo(ts=(3, 2), obj=(2, 1), ul=1),
+                },
+            ),
+        ),
+        (
+            "CASCADE",
+            "a",
+            Crr(
+                tbls={"X": {(2, (1, 1))}, "Y": {(1, 2, (2, 2))}},
+                ctx={1: 2, 2: 2},
+                log={
+                    Val(ts=(1, 1), row=(1, 1), name="x", val=1),
+                    Val(ts=(2, 1), row=(1, 1), name="x", val=2),
+                    Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
+                },
+            ),
+        ),
+        (
+            "CASCADE",
+            "b",
+            Crr(
+                tbls={"X": {(2, (1, 1))}, "Y": {(1, 2, (2, 2))}},
+                ctx={1: 2, 2: 2},
+                log={
+                    Val(ts=(1, 1), row=(1, 1), name="x", val=1),
+                    Val(ts=(2, 1), row=(1, 1), name="x", val=2),
+                    Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
+                },
+            ),
+        ),
+        (
+            "SET NULL",
+            "a",
+            Crr(
+                tbls={"X": {(2, (1, 1))}, "Y": {(1, None, (2, 2))}},
+                ctx={1: 4, 2: 2},
+                log={
+                    Val(ts=(1, 1), row=(1, 1), name="x", val=1),
+                    Val(ts=(2, 1), row=(1, 1), name="x", val=2),
+                    Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
+                    Val(ts=(4, 1), row=(2, 2), name="fk", val=(None, None)),
+                },
+            ),
+        ),
+        (
+            "SET NULL",
+            "b",
+            Crr(
+                tbls={"X": {(2, (1, 1))}, "Y": {(1, None, (2, 2))}},
+                ctx={1: 2, 2: 4},
+                log={
+                    Val(ts=(1, 1), row=(1, 1), name="x", val=1),
+                    Val(ts=(2, 1), row=(1, 1), name="x", val=2),
+                    Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
+                    Val(ts=(4, 2), row=(2, 2), name="fk", val=(None, None)),
+                },
+            ),
+        ),
+    ],
+    ids=[
+        "restrict-a_pulls",
+        "restrict-b_pulls",
+        "cascade-a_pulls",
+        "cascade-b_pulls",
+        "set_null-a_pulls",
+        "set_null-b_pulls",
+    ],
+)
+def test_concur_up_fk_action(
+    mem_uri: typing.Callable[[str], str],
+    action: str,
+    puller: str,
+    expected: Crr,
+) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(connect(mem_uri("b"))) as b:
+        crr_init_clone(
             a,
-            """CREATE TABLE Y(
+            b,
+            f"""
+            CREATE TABLE X(x int PRIMARY KEY);
+            CREATE TABLE Y(
                 y integer PRIMARY KEY,
-                x integer CONSTRAINT fk REFERENCES X(x) ON UPDATE RESTRICT
-            )""",
+                x integer CONSTRAINT fk REFERENCES X(x) ON UPDATE {action}
+            );
+            """,
+            seed="INSERT INTO X VALUES(1)",
         )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        execute(a, "INSERT INTO X VALUES(1)")
-        crr.clone_to(a, b, replica_id=2)
         execute(a, "UPDATE X SET x=2")
-        a.backup(a_bak)
         execute(b, "INSERT INTO Y VALUES(1, 1)")
 
-        crr.pull_from(a, tmp_path / "b.db")
-        assert crr_from(a) == Crr(
-            tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 2))}},
-            ctx={1: 3, 2: 2},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="x", val=1),
-                Val(ts=(2, 1), row=(1, 1), name="x", val=2),
-                Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
-                Undo(ts=(3, 1), obj=(2, 1), ul=1),
-            },
-        )
-
-        crr.pull_from(b, tmp_path / "a.bak.db")
-        assert crr_from(b) == Crr(
-            tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 2))}},
-            ctx={1: 2, 2: 3},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="x", val=1),
-                Val(ts=(2, 1), row=(1, 1), name="x", val=2),
-                Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
-                Undo(ts=(3, 2), obj=(2, 1), ul=1),
-            },
-        )
-        execute(a, "PRAGMA integrity_check")
+        db = crr_pull_by(puller, a, b)
+        assert crr_from(db) == expected
+        execute(db, "PRAGMA integrity_check")
 
 
-def test_concur_up2_fk_restrict(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "a.bak.db") as a_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x int PRIMARY KEY)")
-        execute(
+def test_concur_up2_fk_restrict(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(
+        connect(mem_uri("b"))
+    ) as b, closing(connect(mem_uri("a_bak"))) as a_bak:
+        crr_init_clone(
             a,
-            """CREATE TABLE Y(
+            b,
+            """
+            CREATE TABLE X(x int PRIMARY KEY);
+            CREATE TABLE Y(
                 y integer PRIMARY KEY,
                 x integer CONSTRAINT fk REFERENCES X(x) ON UPDATE RESTRICT
-            )""",
+            );
+            """,
+            seed="INSERT INTO X VALUES(1)",
         )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        execute(a, "INSERT INTO X VALUES(1)")
-        crr.clone_to(a, b, replica_id=2)
-        execute(a, "UPDATE X SET x=2")
-        execute(a, "UPDATE X SET x=3")
+        with transaction(a):
+            execute(a, "UPDATE X SET x=2")
+            execute(a, "UPDATE X SET x=3")
         a.backup(a_bak)
         execute(b, "INSERT INTO Y VALUES(1, 1)")
 
-        crr.pull_from(a, tmp_path / "b.db")
+        crr_pull_from(a, b)
         assert crr_from(a) == Crr(
             tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 2))}},
             ctx={1: 4, 2: 2},
@@ -1327,7 +1414,7 @@ def test_concur_up2_fk_restrict(tmp_path: pathlib.Path) -> None:
             },
         )
 
-        crr.pull_from(b, tmp_path / "a.bak.db")
+        crr_pull_from(b, a_bak)
         assert crr_from(b) == Crr(
             tbls={"X": {(1, (1, 1))}, "Y": {(1, 1, (2, 2))}},
             ctx={1: 3, 2: 4},
@@ -1343,118 +1430,30 @@ def test_concur_up2_fk_restrict(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_concur_up_fk_cascade(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "a.bak.db") as a_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x int PRIMARY KEY)")
-        execute(
-            a,
-            """CREATE TABLE Y(
-                y integer PRIMARY KEY,
-                x integer CONSTRAINT fk REFERENCES X(x) ON UPDATE CASCADE
-            )""",
-        )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        execute(a, "INSERT INTO X VALUES(1)")
-        crr.clone_to(a, b, replica_id=2)
-        execute(a, "UPDATE X SET x=2")
-        a.backup(a_bak)
-        execute(b, "INSERT INTO Y VALUES(1, 1)")
-
-        crr.pull_from(a, tmp_path / "b.db")
-        assert crr_from(a) == Crr(
-            tbls={"X": {(2, (1, 1))}, "Y": {(1, 2, (2, 2))}},
-            ctx={1: 2, 2: 2},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="x", val=1),
-                Val(ts=(2, 1), row=(1, 1), name="x", val=2),
-                Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
-            },
-        )
-
-        crr.pull_from(b, tmp_path / "a.bak.db")
-        assert crr_from(b) == Crr(
-            tbls={"X": {(2, (1, 1))}, "Y": {(1, 2, (2, 2))}},
-            ctx={1: 2, 2: 2},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="x", val=1),
-                Val(ts=(2, 1), row=(1, 1), name="x", val=2),
-                Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
-            },
-        )
-        execute(a, "PRAGMA integrity_check")
-
-
-def test_concur_up_fk_set_null(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "a.bak.db") as a_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x int PRIMARY KEY)")
-        execute(
-            a,
-            """CREATE TABLE Y(
-                y integer PRIMARY KEY,
-                x integer CONSTRAINT fk REFERENCES X(x) ON UPDATE SET NULL
-            )""",
-        )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        execute(a, "INSERT INTO X VALUES(1)")
-        crr.clone_to(a, b, replica_id=2)
-        execute(a, "UPDATE X SET x=2")
-        a.backup(a_bak)
-        execute(b, "INSERT INTO Y VALUES(1, 1)")
-
-        crr.pull_from(a, tmp_path / "b.db")
-        assert crr_from(a) == Crr(
-            tbls={"X": {(2, (1, 1))}, "Y": {(1, None, (2, 2))}},
-            ctx={1: 4, 2: 2},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="x", val=1),
-                Val(ts=(2, 1), row=(1, 1), name="x", val=2),
-                Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
-                Val(ts=(4, 1), row=(2, 2), name="fk", val=(None, None)),
-            },
-        )
-
-        crr.pull_from(b, tmp_path / "a.bak.db")
-        assert crr_from(b) == Crr(
-            tbls={"X": {(2, (1, 1))}, "Y": {(1, None, (2, 2))}},
-            ctx={1: 2, 2: 4},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="x", val=1),
-                Val(ts=(2, 1), row=(1, 1), name="x", val=2),
-                Val(ts=(2, 2), row=(2, 2), name="fk", val=(1, 1)),
-                Val(ts=(4, 2), row=(2, 2), name="fk", val=(None, None)),
-            },
-        )
-        execute(a, "PRAGMA integrity_check")
-
-
-def test_concur_complex_1(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "a.bak.db") as a_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE X(x int PRIMARY KEY)")
-        execute(
+def test_concur_complex_1(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(
+        connect(mem_uri("b"))
+    ) as b, closing(connect(mem_uri("a_bak"))) as a_bak:
+        crr_init_clone(
             a,
-            """CREATE TABLE Y(
+            b,
+            """
+            CREATE TABLE X(x int PRIMARY KEY);
+            CREATE TABLE Y(
                 x int PRIMARY KEY CONSTRAINT fk REFERENCES X(x) ON DELETE RESTRICT ON UPDATE CASCADE
-            )""",
+            );
+            """,
+            seed="INSERT INTO X VALUES(1)",
         )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        execute(a, "INSERT INTO X VALUES(1)")
-        crr.clone_to(a, b, replica_id=2)
-        execute(a, "UPDATE X SET x=2")
-        execute(a, "DELETE FROM X")
+        with transaction(a):
+            execute(a, "UPDATE X SET x=2")
+            execute(a, "DELETE FROM X")
         a.backup(a_bak)
-        execute(b, "INSERT INTO Y(x) VALUES(1)")
-        execute(b, "INSERT INTO X VALUES(2)")
+        with transaction(b):
+            execute(b, "INSERT INTO Y(x) VALUES(1)")
+            execute(b, "INSERT INTO X VALUES(2)")
 
-        crr.pull_from(a, tmp_path / "b.db")
+        crr_pull_from(a, b)
         assert crr_from(a) == Crr(
             tbls={"X": {(2, (1, 1))}, "Y": {(2, (2, 2))}},
             ctx={1: 4, 2: 3},
@@ -1468,7 +1467,7 @@ def test_concur_complex_1(tmp_path: pathlib.Path) -> None:
             },
         )
 
-        crr.pull_from(b, tmp_path / "a.bak.db")
+        crr_pull_from(b, a_bak)
         assert crr_from(b) == Crr(
             tbls={"X": {(2, (1, 1))}, "Y": {(2, (2, 2))}},
             ctx={1: 3, 2: 4},
@@ -1484,29 +1483,23 @@ def test_concur_complex_1(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_concur_complex_2(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a, sqlite3.connect(
-        tmp_path / "b.db"
-    ) as b, sqlite3.connect(tmp_path / "a.bak.db") as a_bak:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, "CREATE TABLE book(id integer PRIMARY KEY AUTOINCREMENT, name text)")
-        execute(
-            a, "CREATE TABLE publisher(id integer PRIMARY KEY AUTOINCREMENT, name text)"
-        )
-        execute(
-            a, "CREATE TABLE store(id integer PRIMARY KEY AUTOINCREMENT, name text)"
-        )
-        execute(
+def test_concur_complex_2(mem_uri: typing.Callable[[str], str]) -> None:
+    with closing(connect(mem_uri("a"))) as a, closing(
+        connect(mem_uri("b"))
+    ) as b, closing(connect(mem_uri("a_bak"))) as a_bak:
+        crr_init_clone(
             a,
-            """CREATE TABLE published_book(
+            b,
+            """
+            CREATE TABLE book(id integer PRIMARY KEY AUTOINCREMENT, name text);
+            CREATE TABLE publisher(id integer PRIMARY KEY AUTOINCREMENT, name text);
+            CREATE TABLE store(id integer PRIMARY KEY AUTOINCREMENT, name text);
+            CREATE TABLE published_book(
                 book_id integer CONSTRAINT book_fk REFERENCES book,
                 publisher_id integer CONSTRAINT publisher_fk REFERENCES publisher,
                 PRIMARY KEY(book_id, publisher_id)
-            )""",
-        )
-        execute(
-            a,
-            """CREATE TABLE availability(
+            );
+            CREATE TABLE availability(
                 book_id integer,
                 publisher_id integer,
                 store_id integer CONSTRAINT store_fk REFERENCES store,
@@ -1514,21 +1507,24 @@ def test_concur_complex_2(tmp_path: pathlib.Path) -> None:
                 PRIMARY KEY(book_id, publisher_id, store_id),
                 CONSTRAINT published_book_fk FOREIGN KEY(book_id, publisher_id)
                     REFERENCES published_book
-            )""",
-        )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
-        execute(a, "INSERT INTO book(name) VALUES ('B1'), ('B2')")
-        execute(a, "INSERT INTO publisher(name) VALUES ('P1'), ('P2')")
-        crr.clone_to(a, b, replica_id=2)
-        execute(a, "INSERT INTO store(name) VALUES('S1')")
-        execute(a, "INSERT INTO published_book VALUES(1, 1)")
-        execute(a, "INSERT INTO availability VALUES(1, 1, 1, 4)")
+            );
+            """,
+            seed="""
+            INSERT INTO book(name) VALUES ('B1'), ('B2');
+            INSERT INTO publisher(name) VALUES ('P1'), ('P2');
+            """,
+        )
+        with transaction(a):
+            execute(a, "INSERT INTO store(name) VALUES('S1')")
+            execute(a, "INSERT INTO published_book VALUES(1, 1)")
+            execute(a, "INSERT INTO availability VALUES(1, 1, 1, 4)")
         a.backup(a_bak)
-        execute(b, "INSERT INTO store(name) VALUES('S2')")
-        execute(b, "INSERT INTO published_book VALUES(1, 2)")
-        execute(b, "INSERT INTO availability VALUES(1, 2, 1, 5)")
+        with transaction(b):
+            execute(b, "INSERT INTO store(name) VALUES('S2')")
+            execute(b, "INSERT INTO published_book VALUES(1, 2)")
+            execute(b, "INSERT INTO availability VALUES(1, 2, 1, 5)")
 
-        crr.pull_from(a, tmp_path / "b.db")
+        crr_pull_from(a, b)
         assert crr_from(a) == Crr(
             tbls={
                 "book": {(1, "B1", (1, 1)), (2, "B2", (2, 1))},
@@ -1558,7 +1554,7 @@ def test_concur_complex_2(tmp_path: pathlib.Path) -> None:
             },
         )
 
-        crr.pull_from(b, tmp_path / "a.bak.db")
+        crr_pull_from(b, a_bak)
         assert crr_from(b) == Crr(
             tbls={
                 "book": {(1, "B1", (1, 1)), (2, "B2", (2, 1))},
@@ -1590,23 +1586,24 @@ def test_concur_complex_2(tmp_path: pathlib.Path) -> None:
         execute(a, "PRAGMA integrity_check")
 
 
-def test_spaced_names(tmp_path: pathlib.Path) -> None:
-    with sqlite3.connect(tmp_path / "a.db") as a:
-        execute(a, "PRAGMA foreign_keys=ON")
-        execute(a, 'CREATE TABLE "X "("x " int PRIMARY KEY)')
-        execute(
-            a,
-            'CREATE TABLE "Y "("x " int PRIMARY KEY CONSTRAINT fk REFERENCES "X "("x "))',
-        )
-        crr.init(a, replica_id=1, conf=_DEFAULT_CONF)
+def test_spaced_names(mem_db: sqlite3.Connection) -> None:
+    a = mem_db
+    crr_init(
+        a,
+        """
+        CREATE TABLE "X "("x " int PRIMARY KEY);
+        CREATE TABLE "Y "("x " int PRIMARY KEY CONSTRAINT fk REFERENCES "X "("x "));
+        """,
+    )
+    with transaction(a):
         execute(a, 'INSERT INTO "X " VALUES(1)')
         execute(a, 'INSERT INTO "Y "("x ") VALUES(1)')
-        assert crr_from(a) == Crr(
-            tbls={"X ": {(1, (1, 1))}, "Y ": {(1, (2, 1))}},
-            ctx={1: 2},
-            log={
-                Val(ts=(1, 1), row=(1, 1), name="x ", val=1),
-                Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
-            },
-        )
-        execute(a, "PRAGMA integrity_check")
+    assert crr_from(a) == Crr(
+        tbls={"X ": {(1, (1, 1))}, "Y ": {(1, (2, 1))}},
+        ctx={1: 2},
+        log={
+            Val(ts=(1, 1), row=(1, 1), name="x ", val=1),
+            Val(ts=(2, 1), row=(2, 1), name="fk", val=(1, 1)),
+        },
+    )
+    execute(a, "PRAGMA integrity_check")
@@ -3,17 +3,30 @@
 
 """Utilities to write concise and expressive tests."""
 
-from contextlib import closing
+from contextlib import contextmanager
+import functools
+import pathlib
 import typing
 from dataclasses import dataclass
+
+# Like the library, tests use the SQLite build bundled by pysqlite3-binary
+# rather than the one the stdlib module links against,
+# so that every platform tests the same SQLite version and compile options.
+# The cost of opening connections is amortized by the template databases below.
 import pysqlite3 as sqlite3
+from synql import crr
+
+# We disable physical clock in order to get deterministic logical timestamps.
+# In this case, every clock corresponds to the latest seen clock incremented by 1.
+DEFAULT_CONF = crr.Config(physical_clock=False)
 
 
 Ts = tuple[int | None, int | None]  # (ts, peer)
 
 
-@dataclass(frozen=True, kw_only=True, slots=True)
-class Val:
+# Log entries are named tuples rather than dataclasses:
+# logs are sets, and tuples are hashed and compared without calling Python code.
+class Val(typing.NamedTuple):
     """Represents a log entry in the database. This can be a foreign key or an regular column."""
 
     ts: Ts
@@ -22,8 +35,7 @@ class Val:
     val: typing.Any
 
 
-@dataclass(frozen=True, kw_only=True, slots=True)
-class Undo:
+class Undo(typing.NamedTuple):
     """Represents an undo entry in the database."""
 
     ts: Ts
@@ -33,25 +45,159 @@ class Undo:
 
 @dataclass(frozen=True, kw_only=True, slots=True)
 class Crr:
-    """Represents a database state."""
+    """Represents a database state.
+
+    Equality compares fields in order and stops at the first difference:
+    the small causal context comes first."""
 
-    tbls: dict[str, set[typing.Any]]
     ctx: dict[int, int]
+    tbls: dict[str, set[typing.Any]]
     log: set[Val | Undo]
 
 
+# The page size must be set before the first write, and must be the same for every
+# database because the backup API cannot copy between in-memory databases
+# of distinct page sizes.
+# Temporary tables and indices stay in memory.
+_EPHEMERAL_PRAGMAS = """
+PRAGMA page_size=8192;
+PRAGMA temp_store=MEMORY;
+"""
+
+
+class _Connection(sqlite3.Connection):
+    """Connection that remembers the path or URI of its database.
+
+    In-memory databases have no file name that `crr.pull_from` could use."""
+
+    path: str
+
+
+def connect(path: pathlib.Path | str, /) -> _Connection:
+    """Open the database `path` with settings suited to short-lived databases.
+
+    `path` can be a URI.
+    The connection is in autocommit mode: use `transaction` to group statements.
+    """
+    db = typing.cast(
+        _Connection,
+        sqlite3.connect(
+            path,
+            uri=True,
+            isolation_level=None,
+            factory=_Connection,
+        ),
+    )
+    db.executescript(_EPHEMERAL_PRAGMAS)
+    db.path = str(path)
+    return db
+
+
 def execute(db: sqlite3.Connection, sql_command: str, /) -> None:
     """Execute `sql_command` on `db`"""
-    with closing(db.cursor()) as cursor:
-        cursor.execute(sql_command)
-    db.commit()
+    db.execute(sql_command)
+
+
+def execute_many(
+    db: sqlite3.Connection, sql_command: str, seq_of_parameters: typing.Any, /
+) -> None:
+    """Execute `sql_command` on `db` once for every item of `seq_of_parameters`.
+
+    The statement is prepared once and is reused for every item."""
+    db.executemany(sql_command, seq_of_parameters)
+
+
+@contextmanager
+def transaction(db: sqlite3.Connection, /) -> typing.Iterator[None]:
+    """Execute the statements of the block in a single transaction of `db`.
+
+    `db` must be in autocommit mode (see `connect`)."""
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise
+    db.execute("COMMIT")
 
 
 def fetch(db: sqlite3.Connection, sql_query: str, /) -> list[typing.Any]:
     """Execute `sql_query` on `db` and returns the resulting rows."""
-    with closing(db.cursor()) as cursor:
-        cursor.execute(sql_query)
-        return cursor.fetchall()
+    return db.execute(sql_query).fetchall()
+
+
+@functools.cache
+def _initialized(schema: str, seed: str, replica_id: int, /) -> sqlite3.Connection:
+    """In-memory database with `schema` made replicable and then populated by `seed`.
+
+    The result is cached: callers must not modify it."""
+    db = connect(":memory:")
+    # `executescript` commits any pending transaction before running its
+    # script: the transaction is thus opened and closed by the script itself.
+    db.executescript(f"PRAGMA foreign_keys=ON; BEGIN; {schema}; COMMIT;")
+    crr.init(db, replica_id=replica_id, conf=DEFAULT_CONF)
+    db.executescript(f"BEGIN; {seed}; COMMIT;")
+    return db
+
+
+def crr_init(
+    db: sqlite3.Connection, schema: str, /, *, seed: str = "", replica_id: int = 1
+) -> None:
+    """Enable foreign keys on `db`, execute `schema` on `db`,
+    make `db` replicable with `DEFAULT_CONF`, and then execute `seed`.
+
+    `db` must be empty.
+    The result of the initialization is computed once per schema and is then copied,
+    because running `crr.init` is far more expensive than copying a database."""
+    execute(db, "PRAGMA foreign_keys=ON")
+    _initialized(schema, seed, replica_id).backup(db)
+
+
+@functools.cache
+def _cloned(
+    schema: str, seed: str, replica_id: int, clone_id: int, /
+) -> sqlite3.Connection:
+    """In-memory clone of `_initialized(schema, seed, replica_id)`.
+
+    The result is cached: callers must not modify it."""
+    db = connect(":memory:")
+    crr.clone_to(_initialized(schema, seed, replica_id), db, replica_id=clone_id)
+    return db
+
+
+def crr_init_clone(
+    db: sqlite3.Connection,
+    clone: sqlite3.Connection,
+    schema: str,
+    /,
+    *,
+    seed: str = "",
+    replica_id: int = 1,
+    clone_id: int = 2,
+) -> None:
+    """Same as `crr_init(db, schema, seed=seed)` followed by `crr.clone_to(db, clone)`.
+
+    Foreign keys are not enabled on `clone`.
+    `db` and `clone` must be empty. Both results are cached as in `crr_init`."""
+    crr_init(db, schema, seed=seed, replica_id=replica_id)
+    _cloned(schema, seed, replica_id, clone_id).backup(clone)
+
+
+def crr_pull_from(db: sqlite3.Connection, remote: _Connection, /) -> None:
+    """Same as `crr.pull_from(db, path)` where `path` is the database of `remote`.
+
+    `remote` must be opened with `connect` and must have no pending transaction."""
+    crr.pull_from(db, remote.path)
+
+
+def crr_pull_by(puller: str, a: _Connection, b: _Connection, /) -> _Connection:
+    """Same as `crr_pull_from(a, b)` if `puller` is "a",
+    and as `crr_pull_from(b, a)` if `puller` is "b".
+
+    Returns the database that pulled."""
+    db, remote = {"a": (a, b), "b": (b, a)}[puller]
+    crr_pull_from(db, remote)
+    return db
 
 
 _SELECT_USER_TABLE_NAME = """--sql
@@ -59,65 +205,56 @@ SELECT name FROM sqlite_master WHERE type = 'table' AND
     name NOT LIKE 'sqlite_%' AND name NOT LIKE '_synql_%';
 """
 
+# Entries of every log in a single pass. The first column tells the kind of entry.
+# Rows are collected in a set: UNION ALL spares SQLite a duplicate elimination.
+_SELECT_LOG = """--sql
+SELECT 'val', ts, peer, row_ts, row_peer, ifnull(name, field), val, NULL
+FROM _synql_log_extra LEFT JOIN _synql_names
+    ON field = id
+UNION ALL
+SELECT 'fk', ts, peer, row_ts, row_peer, ifnull(name, field),
+    foreign_row_ts, foreign_row_peer
+FROM _synql_fklog_extra LEFT JOIN _synql_names
+    ON field = id
+UNION ALL
+SELECT 'undo', ts, peer, obj_ts, obj_peer, NULL, ul, NULL FROM _synql_undolog
+UNION ALL
+SELECT 'undo', ts, peer, row_ts, row_peer, NULL, ul, NULL FROM _synql_id_undo;
+"""
+
+_SELECT_CONTEXT = """--sql
+SELECT peer, ts FROM _synql_context;
+"""
+
+
+@functools.cache
+def _select_tbl(tbl_name: str, /) -> str:
+    """Query that selects the rows of `tbl_name` and their identifier.
+
+    The query is built once per table."""
+    return f"""--sql
+SELECT tbl.*, id.row_ts, id.row_peer
+FROM "{tbl_name}" tbl JOIN "_synql_id_{tbl_name}" AS id ON tbl.rowid = id.rowid;
+"""
+
 
 def crr_from(db: sqlite3.Connection, /) -> Crr:
     """Returns a simplified view of the database state."""
-    tbl_name_rows = fetch(db, _SELECT_USER_TABLE_NAME)
+    # Rows are consumed as the cursors yield them: no intermediate list is built.
     tbls = {}
-    for tbl_name_row in tbl_name_rows:
-        tbl_name = tbl_name_row[0]
-        tbls[tbl_name] = set(
-            r[:-2] + ((r[-2], r[-1]),)
-            for r in fetch(
-                db,
-                f"""SELECT tbl.*, id.row_ts, id.row_peer
-                FROM "{tbl_name}" tbl JOIN "_synql_id_{tbl_name}" AS id ON tbl.rowid = id.rowid""",
-            )
-        )
-    log = (
-        {
-            Val(ts=(ts, peer), row=(row_ts, row_peer), name=name, val=val)
-            for ts, peer, row_ts, row_peer, name, val in fetch(
-                db,
-                """
-                SELECT ts, peer, row_ts, row_peer, ifnull(name, field), val
-                FROM _synql_log_extra LEFT JOIN _synql_names
-                    ON field = id
-                """,
-            )
+    for (tbl_name,) in db.execute(_SELECT_USER_TABLE_NAME):
+        tbls[tbl_name] = {
+            (*r[:-2], (r[-2], r[-1])) for r in db.execute(_select_tbl(tbl_name))
         }
-        .union(
-            {
-                Val(
-                    ts=(ts, peer),
-                    row=(row_ts, row_peer),
-                    name=name,
-                    val=(frow_ts, frow_peer),
-                )
-                for ts, peer, row_ts, row_peer, name, frow_ts, frow_peer in fetch(
-                    db,
-                    """
-                    SELECT ts, peer, row_ts, row_peer, ifnull(name, field),
-                        foreign_row_ts, foreign_row_peer 
-                    FROM _synql_fklog_extra LEFT JOIN _synql_names
-                        ON field = id
-                    """,
-                )
-            }
-        )
-        .union(
-            {
-                Undo(ts=(ts, peer), obj=(obj_ts, obj_peer), ul=ul)
-                for ts, peer, obj_ts, obj_peer, ul in fetch(
-                    db,
-                    """
-                    SELECT ts, peer, obj_ts, obj_peer, ul FROM _synql_undolog
-                    UNION
-                    SELECT ts, peer, row_ts, row_peer, ul FROM _synql_id_undo
-                    """,
-                )
-            }
-        )
-    )
-    ctx = dict(fetch(db, "SELECT peer, ts FROM _synql_context"))
+    log: set[Val | Undo] = set()
+    for kind, ts, peer, obj_ts, obj_peer, name, val, extra in db.execute(_SELECT_LOG):
+        if kind == "undo":
+            log.add(Undo(ts=(ts, peer), obj=(obj_ts, obj_peer), ul=val))
+        elif kind == "fk":
+            log.add(
+                Val(ts=(ts, peer), row=(obj_ts, obj_peer), name=name, val=(val, extra))
+            )
+        else:
+            log.add(Val(ts=(ts, peer), row=(obj_ts, obj_peer), name=name, val=val))
+    ctx = dict(db.execute(_SELECT_CONTEXT))
     return Crr(tbls=tbls, ctx=ctx, log=log)